@@ -0,0 +1,53 @@
+"""Pixel transport to process-pool workers, pickled tiles vs shared memory buffers
+
+Run from the repo root:
+    python -m benchmarks.pixel_transport --sizes 10 25 50 100 --workers 4
+"""
+import argparse
+import math
+import os
+import time
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from data.buffer import ImageEditorPixelBuffer, map_tiles
+
+
+def run(image: np.ndarray, shared: bool, executor: ProcessPoolExecutor, rows: int) -> float:
+    """Seconds to copy image into a buffer and invert it tile by tile through executor"""
+    start = time.perf_counter()
+    source = ImageEditorPixelBuffer.from_array(image, shared)
+    output = ImageEditorPixelBuffer(image.shape, image.dtype.str, shared)
+    map_tiles(np.invert, source, output, executor, rows)
+    elapsed = time.perf_counter() - start
+
+    assert np.array_equal(output.array[::97, ::97], np.invert(image[::97, ::97]))
+    source.close()
+    output.close()
+    return elapsed
+
+
+def main() -> None:
+    """Main function"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 25, 50, 100], help="image sizes in megapixels")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="process pool size")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per size, the best one is kept")
+    args = parser.parse_args()
+
+    print(f"{'MP':>5} {'in-process':>11} {'pickled':>9} {'shared':>9} {'speedup':>8}")
+    with ProcessPoolExecutor(args.workers) as executor:
+        list(executor.map(abs, range(args.workers)))
+        for megapixels in args.sizes:
+            side = int(math.sqrt(megapixels * 1e6))
+            image = np.random.default_rng(0).integers(0, 256, (side, side, 3), np.uint8)
+            rows = math.ceil(side / (args.workers * 4))
+
+            local = min(run(image, False, None, rows) for _ in range(args.repeat))
+            pickled = min(run(image, False, executor, rows) for _ in range(args.repeat))
+            shared = min(run(image, True, executor, rows) for _ in range(args.repeat))
+            fallback = " (/dev/shm too small, shared fell back to pickling)" if ImageEditorPixelBuffer.shared_space() < 2 * image.nbytes else ''
+            print(f"{megapixels:>5} {local:>10.3f}s {pickled:>8.3f}s {shared:>8.3f}s {pickled / shared:>7.2f}x{fallback}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import shutil
+import weakref
+import numpy as np
+from concurrent.futures import Executor
+from typing import Callable, Optional
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+
+class ImageEditorPixelBuffer:
+    def __init__(self, shape: tuple, dtype: str = "uint8", shared: bool = True, name: str = None) -> None:
+        """Initializes the class, creating a buffer or attaching to the shared one called name"""
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.owner = name is None
+        self.memory = None
+        self.finalizer = None
+
+        if shared and shared_memory:
+            try:
+                if name:
+                    self.memory = shared_memory.SharedMemory(name=name)
+                elif self.shared_space() >= self.nbytes:
+                    self.memory = shared_memory.SharedMemory(create=True, size=max(self.nbytes, 1))
+            except OSError:
+                # Attaching must not silently give a private copy, creating may fall back
+                if name:
+                    raise
+                self.memory = None
+
+        if self.memory:
+            self.array = np.ndarray(self.shape, self.dtype, buffer=self.memory.buf)
+            self.finalizer = weakref.finalize(self, ImageEditorPixelBuffer.release, self.memory, self.owner)
+        else:
+            self.array = np.empty(self.shape, self.dtype)
+
+    @classmethod
+    def from_array(cls, array: np.ndarray, shared: bool = True) -> "ImageEditorPixelBuffer":
+        """New buffer holding a copy of array"""
+        buffer = cls(array.shape, array.dtype.str, shared)
+        buffer.array[...] = array
+        return buffer
+
+    @classmethod
+    def attach(cls, name: str, shape: tuple, dtype: str) -> "ImageEditorPixelBuffer":
+        """Attach to a shared buffer created by another process"""
+        return cls(shape, dtype, True, name)
+
+    @staticmethod
+    def shared_space() -> float:
+        """Free bytes for shared memory, a segment larger than /dev/shm allows is created but dies on first write (SIGBUS)"""
+        try:
+            return shutil.disk_usage("/dev/shm").free
+        except OSError:
+            # Not backed by /dev/shm (macOS, Windows), creation fails with OSError instead
+            return float("inf")
+
+    @staticmethod
+    def release(memory: "shared_memory.SharedMemory", owner: bool) -> None:
+        """Unmap shared memory, and free it when owner"""
+        try:
+            memory.close()
+        except BufferError:
+            # Views of the buffer are still alive, the mapping goes away with them
+            pass
+        if owner:
+            try:
+                memory.unlink()
+            except FileNotFoundError:
+                pass
+
+    def close(self) -> None:
+        """Release buffer, the owner also frees shared memory"""
+        self.array = None
+        if self.finalizer:
+            self.finalizer()
+
+    def __enter__(self) -> "ImageEditorPixelBuffer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __reduce__(self) -> tuple:
+        """Pickle shared buffers as a handle, in-process ones by value"""
+        if self.shared:
+            return ImageEditorPixelBuffer.attach, (self.memory.name, self.shape, self.dtype.str)
+        return ImageEditorPixelBuffer.from_array, (self.array, False)
+
+    @property
+    def shared(self) -> bool:
+        return self.memory is not None
+
+    @property
+    def nbytes(self) -> int:
+        return int(np.prod(self.shape)) * self.dtype.itemsize
+
+
+def process_tile(function: Callable, source: ImageEditorPixelBuffer, output: ImageEditorPixelBuffer, tile: tuple) -> Optional[np.ndarray]:
+    """Worker side, process rows tile of source into output, or return it when there is no shared output"""
+    start, stop = tile
+    try:
+        result = function(source.array[start:stop])
+        if output is None:
+            return result
+        output.array[start:stop] = result
+        return None
+    finally:
+        for buffer in (source, output):
+            if buffer is not None and not buffer.owner:
+                buffer.close()
+
+
+def map_tiles(function: Callable, source: ImageEditorPixelBuffer, output: ImageEditorPixelBuffer, executor: Executor = None, rows: int = 256) -> ImageEditorPixelBuffer:
+    """Apply function (picklable, shape preserving) over row tiles of source into output"""
+    height = source.shape[0]
+    tiles = [(start, min(start + rows, height)) for start in range(0, height, rows)]
+
+    if executor is None:
+        for start, stop in tiles:
+            output.array[start:stop] = function(source.array[start:stop])
+        return output
+
+    # Shared buffers travel as handles, in-process ones fall back to pickling each tile
+    futures = []
+    for start, stop in tiles:
+        if source.shared:
+            futures.append(executor.submit(process_tile, function, source, output if output.shared else None, (start, stop)))
+        else:
+            futures.append(executor.submit(function, source.array[start:stop]))
+
+    for (start, stop), future in zip(tiles, futures):
+        result = future.result()
+        if result is not None:
+            output.array[start:stop] = result
+    return output
@@ -1,7 +1,10 @@
 from typing import Tuple
-from PySide6.QtGui import QAction, QIcon, QKeyEvent, Qt
-from PySide6.QtWidgets import QDialog, QLabel, QMainWindow, QWidget
+from PySide6.QtGui import QAction, QColor, QIcon, QKeyEvent, QPainter, QPixmap, Qt
+from PySide6.QtWidgets import QDialog, QDockWidget, QLabel, QMainWindow, QVBoxLayout, QWidget
 from data.engine import ImageEditorScene
+from data.journal import ImageEditorJournal
+from data.render import ImageEditorRenderCache
+from data.stats import ImageEditorStatistics
 from data.template.design import Ui_ImageInfoDialog, Ui_MainWindow, Ui_ResizeDialog, Ui_SettingsDialog
 import json
 
@@ -15,11 +18,14 @@ class ImageEditorMainWindow(Ui_MainWindow, QMainWindow):
 
         self.read_only = False
         self.supported_formats = ["JPG", "JPEG", "PNG", "BMP", "PPM"]
-        self.unsupported_formats = ["GIF", "PBM", "PGM"]
+        self.unsupported_formats = ["GIF", "TIFF", "PBM", "PGM"]
         self.supported_modes = ["RGB", "RGBA"]
-        self.file_filter = "Image File (*.jpg *.jpeg *.png *.bmp *.ppm *.gif *.pbm *.pgm)"
+        self.file_filter = "Image File (*.jpg *.jpeg *.png *.bmp *.ppm *.gif *.tif *.tiff *.pbm *.pgm)"
         
-        self.engine = ImageEditorScene()
+        self.session_file = "data/session.journal"
+        self.engine = ImageEditorScene(ImageEditorJournal(self.session_file))
+        self.render_cache = ImageEditorRenderCache(parent=self)
+        self.statistics = ImageEditorStatistics(parent=self)
         self._scale_factor = 1.0
 
         self.writable_only: list[QAction] = []
@@ -126,6 +132,16 @@ class ImageEditorMainWindow(Ui_MainWindow, QMainWindow):
         self.fileSizeLabel = self.statusbar_label("Size")
         self.fileSizeLabel.hide()
 
+        self.statisticsPanel = ImageEditorStatisticsPanel(self)
+        self.addDockWidget(Qt.RightDockWidgetArea, self.statisticsPanel)
+        self.statisticsPanel.hide()
+        self.actionStatistics = self.statisticsPanel.toggleViewAction()
+        self.actionStatistics.setShortcut("Ctrl+H")
+        self.actionStatistics.setStatusTip("Toggle channel histograms and statistics   [Ctrl H]")
+        self.actionStatistics.setDisabled(True)
+        self.image_required.append(self.actionStatistics)
+        self.addAction(self.actionStatistics)
+
     def toggle_fullscreen(self) -> None:
         """Toggle fullscreen function"""
         if self.isFullScreen():
@@ -205,6 +221,54 @@ class ImageEditorImageInfo(Ui_ImageInfoDialog, QDialog):
         self.extensionLine.setText(info["extension"])
 
 
+class ImageEditorStatisticsPanel(QDockWidget):
+    colors = {"R": "crimson", "G": "seagreen", "B": "royalblue", "A": "gray"}
+
+    def __init__(self, parent: QWidget = None) -> None:
+        """Initializes the class"""
+        super().__init__("Statistics", parent)
+        self.setObjectName("statisticsPanel")
+
+        self.histogramLabel = QLabel(self)
+        self.statisticsLabel = QLabel(self)
+
+        widget = QWidget(self)
+        layout = QVBoxLayout(widget)
+        layout.addWidget(self.histogramLabel)
+        layout.addWidget(self.statisticsLabel)
+        layout.addStretch()
+        self.setWidget(widget)
+
+    def show_statistics(self, statistics: dict) -> None:
+        """Draw channel histograms and fill statistics table"""
+        width, height = 256, 100
+        histogram_pixmap = QPixmap(width, height)
+        histogram_pixmap.fill(Qt.transparent)
+
+        painter = QPainter(histogram_pixmap)
+        for channel, values in statistics["channels"].items():
+            color = QColor(self.colors[channel])
+            color.setAlpha(140)
+            painter.setPen(color)
+            peak = max(int(values["histogram"].max()), 1)
+            for level, count in enumerate(values["histogram"]):
+                painter.drawLine(level, height, level, height - round(count / peak * height))
+        painter.end()
+        self.histogramLabel.setPixmap(histogram_pixmap)
+
+        rows = ''.join(
+            f"<tr><td>{channel}</td><td>{values['min']}</td><td>{values['max']}</td>"
+            f"<td>{values['mean']:.1f}</td><td>{values['shadows']}</td><td>{values['highlights']}</td></tr>"
+            for channel, values in statistics["channels"].items()
+        )
+        estimate = '' if statistics["exact"] else "<p><i>Estimate from a subsample, computing exact values...</i></p>"
+        self.statisticsLabel.setText(
+            "<table cellspacing=\"6\">"
+            "<tr><th></th><th>Min</th><th>Max</th><th>Mean</th><th>Clipped 0</th><th>Clipped 255</th></tr>"
+            f"{rows}</table>{estimate}"
+        )
+
+
 class ImageEditorSettings(Ui_SettingsDialog, QDialog):
     def __init__(self, settings: dict, parent: QWidget) -> None:
         """Initializes the class"""
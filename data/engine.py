@@ -1,66 +1,90 @@
 import os
 from PIL import Image
-from enum import Enum, auto
 from PySide6.QtWidgets import QGraphicsScene
 from PySide6.QtGui import QPixmap
-
-
-class ImageEditorFilterTag(Enum):
-    BLUR = auto()
-    SEPIA = auto()
-    GRAYSCALE = auto()
-    EDGES = auto()
-
-
-class ImageEditorTransformTag(Enum):
-    HORIZONTALFLIP = auto()
-    VERTICALFLIP = auto()
-    CLOCKROTATE = auto()
-    ANTICLOCKROTATE = auto()
-
-
-class ImageEditorControlTag(Enum):
-    OPEN = auto()
-    SAVE = auto()
-    SAVEAS = auto()
-    STATE = auto()
-
-
-class ImageEditorSceneTag(Enum):
-    START = auto()
-    FIRST = auto()
-    LAST = auto()
-    MIDDLE = auto()
+from data.frames import ImageEditorFrameSequence
+from data.journal import ImageEditorJournal, ImageEditorJournalSession
+from data.tags import ImageEditorControlTag, ImageEditorFilterTag, ImageEditorSceneTag, ImageEditorTransformTag
 
 
 class ImageEditorScene:
-    def __init__(self) -> None:
+    def __init__(self, journal: ImageEditorJournal = None) -> None:
         """Initializes the class"""
+        self.journal = journal
         self.changes: list[QPixmap] = []
         self.head: int = None
         self.tail: int = None
         self.scene = None
+        self.item = None
+        self.frames: ImageEditorFrameSequence = None
         self.path = ''
         self.info = {}
     
     def new(self, path: str) -> None:
         """Set new file"""
-        image = QPixmap(path)
+        if self.frames:
+            self.frames.close()
+        
+        self.frames = ImageEditorFrameSequence(path)
+        if self.frames.animated:
+            image = QPixmap.fromImage(self.frames.seek(0))
+        else:
+            self.frames.close()
+            self.frames = None
+            image = QPixmap(path)
+
+        self.reset(image)
+        self.set_info(image, path)
+
+        if self.journal:
+            self.journal.start(path, 0, self.head)
+    
+    def step_frame(self, step: int) -> None:
+        """Set a neighbour frame of a multi-frame file, discarding the history"""
+        if not self.frames:
+            return
+        
+        image = QPixmap.fromImage(self.frames.seek(self.frames.index + step))
+        self.reset(image)
+        self.set_info(image)
 
+        if self.journal:
+            self.journal.start(self.info["path"], self.frames.index, self.head)
+    
+    def reset(self, pixmap: QPixmap) -> None:
+        """Start history from pixmap"""
         self.head = 0
         self.tail = 0
     
         self.changes.clear()
-        self.changes.append(image)
+        self.changes.append(pixmap)
 
         self.set_scene()
-        self.set_info(image, path)
-    
+
+    def restore(self, session: ImageEditorJournalSession) -> None:
+        """Set session left in journal, replaying from its newest snapshot"""
+        journal, self.journal = self.journal, None
+        self.new(session.path)
+        self.step_frame(session.frame)
+        self.journal = journal
+
+        self.changes = session.replay(self.pixmap)
+        self.head = session.relative_head
+        self.tail = None if session.keyframed else 0
+
+        self.set_scene()
+        self.set_info(self.pixmap)
+
+        if self.journal:
+            self.journal.start(session.path, session.frame, 0, self.changes[0].toImage() if session.keyframed else None)
+            for head, operation in enumerate(session.chain, 1):
+                self.journal.operation(head, operation, self.changes[head])
+            self.journal.head(self.head)
 
     def set_scene(self) -> None:
         """Set scene from head tag"""
         self.scene = QGraphicsScene()
-        self.scene.addPixmap(self.pixmap)
+        self.item = self.scene.addPixmap(self.pixmap)
     
     def set_info(self, pixmap: QPixmap = None, path: str = None) -> None:
         """Set info about actual image state"""
@@ -79,8 +103,8 @@ class ImageEditorScene:
             self.info["format"] = image.format
             self.info["mode"] = image.mode
     
-    def add(self, pixmap: QPixmap) -> None:
-        """Append new QPixmap"""
+    def add(self, pixmap: QPixmap, operation: dict) -> None:
+        """Append new QPixmap produced by operation (see data.operations.apply_operation)"""
         if self.head != len(self.changes) - 1:
             self.changes = self.changes[:self.head + 1]
         
@@ -90,6 +114,9 @@ class ImageEditorScene:
         self.set_scene()
         self.set_info(self.pixmap)
 
+        if self.journal:
+            self.journal.operation(self.head, operation, pixmap)
+
     def undo(self) -> None:
         """Backward one index"""
         if self.empty or self.head == 0:
@@ -98,6 +125,9 @@ class ImageEditorScene:
         self.head -= 1
         self.set_scene()
         self.set_info(self.pixmap)
+
+        if self.journal:
+            self.journal.head(self.head)
     
     def redo(self) -> None:
         """Forward one index"""
@@ -107,6 +137,9 @@ class ImageEditorScene:
         self.head += 1
         self.set_scene()
         self.set_info(self.pixmap)
+
+        if self.journal:
+            self.journal.head(self.head)
     
     def save(self, path: str = None) -> None:
         """Set save changes"""
@@ -118,6 +151,9 @@ class ImageEditorScene:
         
         self.tail = self.head
 
+        if self.journal:
+            self.journal.start(self.info["path"], 0, self.head)
+
     @property
     def first_save(self):
         return not self.tail
@@ -0,0 +1,210 @@
+import io
+import struct
+import threading
+from collections import OrderedDict
+from PIL import Image
+from PySide6.QtCore import QRunnable, QThreadPool
+from PySide6.QtGui import QImage
+
+
+class ImageEditorFramePrefetch(QRunnable):
+    def __init__(self, sequence: "ImageEditorFrameSequence", index: int) -> None:
+        """Initializes the class"""
+        super().__init__()
+        self.sequence = sequence
+        self.index = index
+
+    def run(self) -> None:
+        """Decode the frame into the sequence cache"""
+        if not self.sequence.closed:
+            self.sequence.frame(self.index)
+
+
+class ImageEditorGifFrames:
+    def __init__(self, path: str, interval: int = 16, capacity: int = 8) -> None:
+        """Initializes the class, indexing frame offsets without decoding them"""
+        self.interval = interval
+        self.capacity = capacity
+        self.file = open(path, "rb")
+        self.header = b""
+        self.size = 0, 0
+
+        # (start, end, extent, disposal) of every frame, a damaged file keeps the frames read so far
+        self.frames: list[tuple[int, int, tuple, int]] = []
+        try:
+            self.header = self.read(13)
+            self.size = struct.unpack("<2H", self.header[6:10])
+            if self.header[10] & 0x80:
+                self.header += self.read(3 << ((self.header[10] & 7) + 1))
+            self.index()
+        except EOFError:
+            pass
+
+        # Canvas before some interval-th frames are drawn (least recently used dropped past
+        # capacity), a seek restarts from the nearest one or from the blank canvas
+        self.blank = Image.new("RGBA", self.size)
+        self.checkpoints: OrderedDict[int, Image.Image] = OrderedDict()
+
+    def read(self, size: int) -> bytes:
+        """Read exactly size bytes"""
+        data = self.file.read(size)
+        if len(data) < size:
+            raise EOFError("truncated GIF file")
+        return data
+
+    def skip_blocks(self) -> None:
+        """Skip data sub-blocks up to their terminator"""
+        while size := self.read(1)[0]:
+            self.read(size)
+
+    def index(self) -> None:
+        """Walk the file once, recording where each frame (with its control extension) starts and ends"""
+        start, disposal = None, 0
+        while True:
+            position = self.file.tell()
+            block = self.file.read(1)
+            if block == b"!":
+                label = self.read(1)
+                if label == b"\xf9":
+                    start = position if start is None else start
+                    control = self.read(self.read(1)[0])
+                    disposal = (control[0] >> 2) & 7 if control else 0
+                self.skip_blocks()
+            elif block == b",":
+                start = position if start is None else start
+                x0, y0, width, height, flags = struct.unpack("<4HB", self.read(9))
+                if flags & 0x80:
+                    self.read(3 << ((flags & 7) + 1))
+                self.read(1)
+                self.skip_blocks()
+
+                # Clamped to the logical screen, a frame lying outside it has an empty extent
+                x0, y0 = min(x0, self.size[0]), min(y0, self.size[1])
+                extent = x0, y0, min(x0 + width, self.size[0]), min(y0 + height, self.size[1])
+                self.frames.append((start, self.file.tell(), extent, disposal))
+                start, disposal = None, 0
+            else:
+                break
+
+    def tile(self, index: int) -> Image.Image:
+        """Decode frame alone, as a single-frame GIF sharing the file header, None when it draws nothing"""
+        start, end, extent, _ = self.frames[index]
+        if extent[0] >= extent[2] or extent[1] >= extent[3]:
+            return None
+
+        self.file.seek(start)
+        data = self.header + self.file.read(end - start) + b";"
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                return image.convert("RGBA").crop(extent)
+        except (OSError, ValueError, EOFError):
+            # Undecodable frame data leaves the canvas as it is, as viewers do
+            return None
+
+    def frame(self, index: int) -> Image.Image:
+        """Composite frame, drawing from the nearest checkpoint at or before it"""
+        start = max((checkpoint for checkpoint in self.checkpoints if checkpoint <= index), default=0)
+        if start:
+            self.checkpoints.move_to_end(start)
+            canvas = self.checkpoints[start].copy()
+        else:
+            canvas = self.blank.copy()
+
+        for current in range(start, index + 1):
+            _, _, extent, disposal = self.frames[current]
+            previous = canvas.copy() if disposal == 3 else None
+            tile = self.tile(current)
+            if tile:
+                canvas.alpha_composite(tile, extent[:2])
+            if current == index:
+                return canvas
+
+            if disposal == 2 and tile:
+                canvas.paste((0, 0, 0, 0), extent)
+            elif disposal == 3:
+                canvas = previous
+            if (current + 1) % self.interval == 0:
+                self.checkpoints[current + 1] = canvas.copy()
+                self.checkpoints.move_to_end(current + 1)
+                while len(self.checkpoints) > self.capacity:
+                    self.checkpoints.popitem(last=False)
+
+    def close(self) -> None:
+        """Release file and checkpoints"""
+        self.checkpoints.clear()
+        self.file.close()
+
+    @property
+    def count(self) -> int:
+        return len(self.frames)
+
+
+class ImageEditorFrameSequence:
+    def __init__(self, path: str, capacity: int = 8, prefetch: int = 1) -> None:
+        """Initializes the class"""
+        self.path = path
+        self.capacity = capacity
+        self.prefetch = prefetch
+        self.index = 0
+
+        self.cache: OrderedDict[int, QImage] = OrderedDict()
+        self.lock = threading.Lock()
+        self.pool = QThreadPool.globalInstance()
+        self.closed = False
+
+        # TIFF seeks jump to the page offsets Pillow records, but Pillow rewinds GIFs
+        # to frame 0 on every backward seek, so those are composited from checkpoints
+        self.image = Image.open(path)
+        if self.image.format == "GIF":
+            frames = ImageEditorGifFrames(path, capacity=capacity)
+            if frames.count:
+                self.image.close()
+                self.image = frames
+            else:
+                frames.close()
+        if isinstance(self.image, ImageEditorGifFrames):
+            self.count: int = self.image.count
+        else:
+            self.count: int = getattr(self.image, "n_frames", 1)
+
+    def frame(self, index: int) -> QImage:
+        """Decoded frame from cache, or from file when it isn't cached"""
+        with self.lock:
+            if self.closed:
+                return None
+            if index in self.cache:
+                self.cache.move_to_end(index)
+                return self.cache[index]
+
+            if isinstance(self.image, ImageEditorGifFrames):
+                frame = self.image.frame(index).toqimage().copy()
+            else:
+                self.image.seek(index)
+                frame = self.image.convert("RGBA").toqimage().copy()
+
+            self.cache[index] = frame
+            while len(self.cache) > self.capacity:
+                self.cache.popitem(last=False)
+            return frame
+
+    def seek(self, index: int) -> QImage:
+        """Set actual frame and prefetch its neighbours (without wrapping around the ends)"""
+        self.index = index % self.count
+        frame = self.frame(self.index)
+
+        for offset in range(1, self.prefetch + 1):
+            for neighbour in (self.index + offset, self.index - offset):
+                if 0 <= neighbour < self.count and neighbour not in self.cache:
+                    self.pool.start(ImageEditorFramePrefetch(self, neighbour))
+        return frame
+
+    def close(self) -> None:
+        """Release file and cached frames"""
+        with self.lock:
+            self.cache.clear()
+            self.image.close()
+            self.closed = True
+
+    @property
+    def animated(self) -> bool:
+        return self.count > 1
@@ -0,0 +1,231 @@
+import json
+import os
+import queue
+import threading
+import time
+from PySide6.QtCore import QBuffer, QIODevice
+from PySide6.QtGui import QImage, QPixmap
+from data.operations import apply_operation
+from data.tags import ImageEditorJournalTag
+
+
+class ImageEditorJournalSession:
+    def __init__(self, path: str) -> None:
+        """Initializes the class"""
+        self.journal_path = path
+        self.path = ''
+        self.frame = 0
+        self.head = 0
+        self.file: int = None
+        self.keyframes: dict[int, tuple[int, int]] = {}
+        self.operations: dict[int, dict] = {}
+
+    def read(self, record: dict) -> None:
+        """Apply a journal record to the session history"""
+        tag = ImageEditorJournalTag[record["record"]]
+        head = record["head"]
+        if tag is ImageEditorJournalTag.OPEN:
+            self.path = record["path"]
+            self.frame = record["frame"]
+            self.file = head
+            self.head = head
+            self.keyframes.clear()
+            self.operations.clear()
+        elif tag is ImageEditorJournalTag.OPERATION:
+            self.truncate(head)
+            self.operations[head] = record["operation"]
+            self.head = head
+        elif tag is ImageEditorJournalTag.KEYFRAME:
+            self.keyframes[head] = record["offset"], record["size"]
+        elif tag is ImageEditorJournalTag.HEAD:
+            self.head = head
+
+    def truncate(self, head: int) -> None:
+        """Drop every state from head onwards, as a new operation does"""
+        self.operations = {key: value for key, value in self.operations.items() if key < head}
+        self.keyframes = {key: value for key, value in self.keyframes.items() if key < head}
+        if self.file is not None and self.file >= head:
+            self.file = None
+
+    def keyframe(self, head: int) -> QImage:
+        """Decode keyframe of head state, None when there is no keyframe"""
+        if head not in self.keyframes:
+            return None
+
+        offset, size = self.keyframes[head]
+        with open(self.journal_path, "rb") as file:
+            file.seek(offset)
+            return QImage.fromData(file.read(size), "PNG")
+
+    @property
+    def base(self) -> int:
+        """Newest snapshot (keyframe or file) at or before head"""
+        snapshots = set(self.keyframes)
+        if self.file is not None:
+            snapshots.add(self.file)
+        if not snapshots:
+            return None
+
+        before = [snapshot for snapshot in snapshots if snapshot <= self.head]
+        return max(before) if before else min(snapshots)
+
+    @property
+    def chain(self) -> list[dict]:
+        """Operations after base, in order"""
+        chain = []
+        head = self.base + 1
+        while head in self.operations:
+            chain.append(self.operations[head])
+            head += 1
+        return chain
+
+    @property
+    def keyframed(self) -> bool:
+        """If base is a keyframe instead of the file itself"""
+        return self.base in self.keyframes
+
+    @property
+    def relative_head(self) -> int:
+        """Head relative to base"""
+        return min(max(self.head - self.base, 0), len(self.chain))
+
+    @property
+    def restorable(self) -> bool:
+        return self.base is not None and \
+               bool(self.operations or self.keyframes) and \
+               os.path.exists(self.path)
+
+    def replay(self, pixmap: QPixmap) -> list[QPixmap]:
+        """History from base, pixmap is the file state used when base isn't a keyframe"""
+        image = self.keyframe(self.base)
+        changes = [QPixmap.fromImage(image) if image else pixmap]
+        for head, operation in enumerate(self.chain, self.base + 1):
+            # Later keyframes are decoded instead of recomputing their state
+            image = self.keyframe(head)
+            changes.append(QPixmap.fromImage(image) if image else apply_operation(changes[-1], operation))
+        return changes
+
+
+class ImageEditorJournal:
+    def __init__(self, path: str, interval: int = 8, delay: float = 0.5) -> None:
+        """Initializes the class"""
+        self.path = path
+        self.interval = interval
+        self.delay = delay
+
+        self.known: set[int] = {0}
+        self.since = 0
+
+        self.queue: queue.Queue = queue.Queue()
+        self.thread = threading.Thread(target=self.write, daemon=True)
+        self.thread.start()
+
+    @staticmethod
+    def load(path: str) -> ImageEditorJournalSession:
+        """Read session left in journal file, stopping at a torn record"""
+        session = ImageEditorJournalSession(path)
+        if not os.path.exists(path):
+            return session
+
+        size = os.path.getsize(path)
+        with open(path, "rb") as file:
+            for line in iter(file.readline, b''):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+
+                if record["record"] == ImageEditorJournalTag.KEYFRAME.name:
+                    record["offset"] = file.tell()
+                    if record["offset"] + record["size"] + 1 > size:
+                        break
+                    file.seek(record["size"] + 1, os.SEEK_CUR)
+                session.read(record)
+        return session
+
+    def start(self, path: str, frame: int, head: int, image: QImage = None) -> None:
+        """Restart journal from file (or image, when it isn't the file state)"""
+        self.known = {head}
+        self.since = 0
+        self.queue.put({"record": ImageEditorJournalTag.OPEN.name, "head": head, "path": path, "frame": frame})
+        if image:
+            self.keyframe(head, image)
+
+    def operation(self, head: int, operation: dict, pixmap: QPixmap) -> None:
+        """Append operation that produced the head state"""
+        self.queue.put({"record": ImageEditorJournalTag.OPERATION.name, "head": head, "operation": operation})
+        self.since += 1
+
+        # A parent state the journal can't rebuild leaves a keyframe as the only way back to this one
+        parent_known = head - 1 in self.known
+        self.known = {known for known in self.known if known < head}
+        self.known.add(head)
+        if not parent_known or self.since >= self.interval:
+            self.keyframe(head, pixmap.toImage())
+
+    def keyframe(self, head: int, image: QImage) -> None:
+        """Append a snapshot of the head state"""
+        self.since = 0
+        self.queue.put({"record": ImageEditorJournalTag.KEYFRAME.name, "head": head, "image": image})
+
+    def head(self, head: int) -> None:
+        """Append an undo/redo move"""
+        self.queue.put({"record": ImageEditorJournalTag.HEAD.name, "head": head})
+
+    def close(self, discard: bool = False) -> None:
+        """Flush pending records and stop writer, removing journal file if discard"""
+        self.queue.put(None)
+        self.thread.join()
+        if discard and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def write(self) -> None:
+        """Writer thread, appends records in batches and syncs once per batch"""
+        file = None
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.delay
+            while batch[-1] is not None:
+                try:
+                    batch.append(self.queue.get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+
+            for record in batch:
+                if record is None:
+                    break
+                try:
+                    if record["record"] == ImageEditorJournalTag.OPEN.name:
+                        if file:
+                            file.close()
+                        file = open(self.path, "wb")
+                    if file:
+                        self.write_record(file, record)
+                except OSError:
+                    pass
+
+            if file:
+                try:
+                    file.flush()
+                    os.fsync(file.fileno())
+                except OSError:
+                    pass
+
+            if batch[-1] is None:
+                if file:
+                    file.close()
+                return
+
+    def write_record(self, file, record: dict) -> None:
+        """Write record as a JSON line, keyframes followed by their PNG data"""
+        data = None
+        if record["record"] == ImageEditorJournalTag.KEYFRAME.name:
+            buffer = QBuffer()
+            buffer.open(QIODevice.WriteOnly)
+            record.pop("image").save(buffer, "PNG")
+            data = buffer.data().data()
+            record["size"] = len(data)
+
+        file.write(json.dumps(record).encode() + b'\n')
+        if data is not None:
+            file.write(data + b'\n')
@@ -0,0 +1,63 @@
+from PIL import Image, ImageFilter
+from PySide6.QtGui import QPixmap
+from data.tags import ImageEditorFilterTag, ImageEditorTransformTag
+import numpy as np
+
+
+def filter_pixmap(pixmap: QPixmap, tag: ImageEditorFilterTag) -> QPixmap:
+    """Filter image (QPixmap) based on filter tag"""
+    image = Image.fromqpixmap(pixmap)
+    mode = image.mode
+    if mode == "RGBA":
+        alpha = image.getchannel('A')
+
+    if tag is ImageEditorFilterTag.BLUR:
+        result = image.filter(ImageFilter.BLUR)
+    elif tag is ImageEditorFilterTag.EDGES:
+        result = image.filter(ImageFilter.FIND_EDGES)
+    elif tag is ImageEditorFilterTag.GRAYSCALE:
+        result = image.convert('L')
+    elif tag is ImageEditorFilterTag.SEPIA:
+        pix = np.array(image)
+        if mode == "RGBA":
+            sepia_filter = np.array([[.393, .769, .189, 0], [.349, .686, .168, 0], [.272, .534, .131, 0]])
+        else:
+            sepia_filter = np.array([[.393, .769, .189], [.349, .686, .168], [.272, .534, .131]])
+        pix: np.ndarray = pix.dot(sepia_filter.T)
+        pix[pix>255] = 255
+        result = Image.fromarray(pix.astype(np.uint8))
+
+    if mode == "RGBA":
+        result.putalpha(alpha)
+
+    return result.toqpixmap()
+
+
+def transform_pixmap(pixmap: QPixmap, tag: ImageEditorTransformTag) -> QPixmap:
+    """Tranform image (QPixmap) based on transform tag"""
+    image = np.array(Image.fromqpixmap(pixmap))
+    if tag is ImageEditorTransformTag.HORIZONTALFLIP:
+        image = np.fliplr(image)
+    elif tag is ImageEditorTransformTag.VERTICALFLIP:
+        image = np.flipud(image)
+    elif tag is ImageEditorTransformTag.CLOCKROTATE:
+        image = np.rot90(image, 1)
+    elif tag is ImageEditorTransformTag.ANTICLOCKROTATE:
+        image = np.rot90(image, -1)
+    return Image.fromarray(image).toqpixmap()
+
+
+def resize_pixmap(pixmap: QPixmap, width: int, height: int) -> QPixmap:
+    """Resize image (QPixmap) to width and height"""
+    return pixmap.scaled(width, height)
+
+
+def apply_operation(pixmap: QPixmap, operation: dict) -> QPixmap:
+    """Apply a recorded operation (see ImageEditorScene.add) to image (QPixmap)"""
+    if operation["type"] == "filter":
+        return filter_pixmap(pixmap, ImageEditorFilterTag[operation["tag"]])
+    elif operation["type"] == "transform":
+        return transform_pixmap(pixmap, ImageEditorTransformTag[operation["tag"]])
+    elif operation["type"] == "resize":
+        return resize_pixmap(pixmap, *operation["size"])
+    raise ValueError(f"Unknown operation type: {operation['type']}")
@@ -0,0 +1,141 @@
+import math
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap, QTransform
+from PySide6.QtWidgets import QGraphicsPixmapItem
+
+
+class ImageEditorRenderSignals(QObject):
+    rendered = Signal(int, float, QImage)
+
+
+class ImageEditorRenderTask(QRunnable):
+    def __init__(self, generation: int, image: QImage, level: float, cache: "ImageEditorRenderCache") -> None:
+        """Initializes the class"""
+        super().__init__()
+        self.generation = generation
+        self.image = image
+        self.level = level
+        self.cache = cache
+
+    def run(self) -> None:
+        """Scale the source image to the zoom level"""
+        if self.stale:
+            # A null image only clears the pending level
+            self.cache.signals.rendered.emit(self.generation, self.level, QImage())
+            return
+
+        width = max(1, round(self.image.width() * self.level))
+        height = max(1, round(self.image.height() * self.level))
+        image = self.image.scaled(width, height, Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        self.cache.signals.rendered.emit(self.generation, self.level, image)
+
+    @property
+    def stale(self) -> bool:
+        """If the source changed or the level left the zoom window since the task was queued"""
+        return self.generation != self.cache.generation or \
+               self.level not in self.cache.window(self.cache.level(self.cache.scale_factor))
+
+
+class ImageEditorRenderCache(QObject):
+    def __init__(self, step: float = 0.05, neighbours: int = 1, delay: int = 150, parent: QObject = None) -> None:
+        """Initializes the class"""
+        super().__init__(parent)
+        self.step = step
+        self.neighbours = neighbours
+
+        self.cache: dict[float, QPixmap] = {}
+        self.pending: set[float] = set()
+        self.generation = 0
+        self.scale_factor = 1.0
+        self.item: QGraphicsPixmapItem = None
+        self.source: QPixmap = None
+        self.image: QImage = None
+
+        self.pool = QThreadPool.globalInstance()
+        self.signals = ImageEditorRenderSignals()
+        self.signals.rendered.connect(self.store)
+
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.settle)
+
+    def reset(self, item: QGraphicsPixmapItem, source: QPixmap) -> None:
+        """Set pixmap item showing source and drop every pre-scaled copy"""
+        self.generation += 1
+        self.timer.stop()
+        self.cache.clear()
+        self.pending.clear()
+
+        # The item may be reused while still showing a pre-scaled copy
+        self.item = item
+        self.source = source
+        self.image = None
+        self.item.setPixmap(source)
+        self.item.setTransform(QTransform())
+        self.item.setTransformationMode(Qt.SmoothTransformation)
+
+    def level(self, scale: float) -> float:
+        """Zoom level of the cached copy used for scale (never smaller than scale)"""
+        return round(math.ceil(round(scale / self.step, 6)) * self.step, 2)
+
+    def window(self, level: float) -> list[float]:
+        """Current and neighbouring zoom levels worth keeping pre-scaled"""
+        levels = [round(level + i * self.step, 2) for i in range(-self.neighbours, self.neighbours + 1)]
+        return [value for value in levels if 0 < value < 1]
+
+    def zoom(self, scale: float) -> None:
+        """Called on every scale change, renders fast and defers the smooth render"""
+        self.scale_factor = scale
+        if not self.item:
+            return
+
+        self.item.setTransformationMode(Qt.FastTransformation)
+        self.timer.start()
+
+    def settle(self) -> None:
+        """Called once a burst of zoom changes is over"""
+        level = self.level(self.scale_factor)
+        window = self.window(level)
+
+        for cached in list(self.cache):
+            if cached not in window:
+                del self.cache[cached]
+
+        if window and self.image is None:
+            # Only converted once a level below 1 is needed, at zoom >= 1 the source is shown as is
+            self.image = self.source.toImage()
+
+        for value in window:
+            if value not in self.cache and value not in self.pending:
+                self.pending.add(value)
+                self.pool.start(ImageEditorRenderTask(self.generation, self.image, value, self))
+
+        self.display()
+
+    def store(self, generation: int, level: float, image: QImage) -> None:
+        """Receive a pre-scaled copy from the thread pool"""
+        if generation != self.generation:
+            return
+
+        self.pending.discard(level)
+        if image.isNull() or level not in self.window(self.level(self.scale_factor)):
+            return
+
+        self.cache[level] = QPixmap.fromImage(image)
+        if level == self.level(self.scale_factor) and not self.timer.isActive():
+            self.display()
+
+    def display(self) -> None:
+        """Show the cached copy for the current scale, or the source when there is none"""
+        pixmap = self.cache.get(self.level(self.scale_factor))
+        if pixmap:
+            self.item.setPixmap(pixmap)
+            self.item.setTransform(QTransform.fromScale(
+                self.source.width() / pixmap.width(),
+                self.source.height() / pixmap.height()
+            ))
+        else:
+            self.item.setPixmap(self.source)
+            self.item.setTransform(QTransform())
+        self.item.setTransformationMode(Qt.SmoothTransformation)
@@ -0,0 +1,119 @@
+import math
+from collections import OrderedDict
+import numpy as np
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Qt, Signal
+from PySide6.QtGui import QImage, QPixmap
+
+
+def image_array(image: QImage) -> tuple[np.ndarray, QImage]:
+    """View QImage as a (height, width, 4) RGBA array, along with the converted QImage owning its data"""
+    image = image.convertToFormat(QImage.Format_RGBA8888)
+    array = np.frombuffer(image.constBits(), np.uint8).reshape(image.height(), image.bytesPerLine())
+    return array[:, :image.width() * 4].reshape(image.height(), image.width(), 4), image
+
+
+def image_statistics(array: np.ndarray, channels: str, scale: float = 1.0) -> dict:
+    """Histogram, min, max, mean and clipped counts per channel, array being a subsample of 1 / scale of the pixels"""
+    statistics = {"exact": scale == 1.0, "channels": {}}
+
+    levels = np.arange(256)
+    for index, channel in enumerate(channels):
+        histogram = np.bincount(array[:, :, index].ravel(), minlength=256)
+        used = np.flatnonzero(histogram)
+        statistics["channels"][channel] = {
+            "histogram": histogram,
+            "min": int(used[0]) if used.size else 0,
+            "max": int(used[-1]) if used.size else 0,
+            "mean": float(histogram @ levels) / max(int(histogram.sum()), 1),
+            "shadows": round(int(histogram[0]) * scale),
+            "highlights": round(int(histogram[255]) * scale),
+        }
+    return statistics
+
+
+class ImageEditorStatisticsSignals(QObject):
+    computed = Signal(object, object)
+
+
+class ImageEditorStatisticsTask(QRunnable):
+    def __init__(self, key: int, image: QImage, channels: str, signals: ImageEditorStatisticsSignals) -> None:
+        """Initializes the class"""
+        super().__init__()
+        self.key = key
+        self.image = image
+        self.channels = channels
+        self.signals = signals
+
+    def run(self) -> None:
+        """Compute exact statistics from the full image"""
+        array, _ = image_array(self.image)
+        self.signals.computed.emit(self.key, image_statistics(array, self.channels))
+
+
+class ImageEditorStatistics(QObject):
+    updated = Signal(object)
+
+    def __init__(self, capacity: int = 64, sample: int = 256 * 1024, parent: QObject = None) -> None:
+        """Initializes the class"""
+        super().__init__(parent)
+        self.capacity = capacity
+        self.sample = sample
+
+        self.cache: OrderedDict[int, dict] = OrderedDict()
+        self.pending: set[int] = set()
+        self.aliases: dict[int, list[int]] = {}
+
+        self.pool = QThreadPool.globalInstance()
+        self.signals = ImageEditorStatisticsSignals()
+        self.signals.computed.connect(self.store)
+
+    def get(self, pixmap: QPixmap) -> dict:
+        """Cached statistics of pixmap, or a subsampled estimate while the exact ones are computed"""
+        key = pixmap.cacheKey()
+        if key in self.cache:
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        channels = "RGBA" if pixmap.hasAlphaChannel() else "RGB"
+        image = pixmap.toImage()
+        width, height = image.width(), image.height()
+        step = max(1, math.ceil(math.sqrt(width * height / self.sample)))
+
+        # Subsample (nearest pixel, as a stride would) before converting, so only the sample is copied here
+        if step > 1:
+            sample = image.scaled(max(1, width // step), max(1, height // step), Qt.IgnoreAspectRatio, Qt.FastTransformation)
+        else:
+            sample = image
+        array, _ = image_array(sample)
+        statistics = image_statistics(array, channels, width * height / (array.shape[0] * array.shape[1]))
+
+        if statistics["exact"]:
+            # The caller shows what is returned, no update to announce
+            self.store(key, statistics, False)
+        elif key not in self.pending:
+            self.pending.add(key)
+            self.pool.start(ImageEditorStatisticsTask(key, image, channels, self.signals))
+        return statistics
+
+    def inherit(self, parent: QPixmap, child: QPixmap) -> None:
+        """Reuse parent statistics for child, for operations that only move pixels (flips, rotations)"""
+        key = parent.cacheKey()
+        if key in self.cache:
+            self.store(child.cacheKey(), self.cache[key])
+        elif key in self.pending:
+            # Pending too, so get() returns an estimate instead of starting its own task
+            self.pending.add(child.cacheKey())
+            self.aliases.setdefault(key, []).append(child.cacheKey())
+
+    def store(self, key: int, statistics: dict, notify: bool = True) -> None:
+        """Cache statistics of key state, emitting updated if notify"""
+        self.pending.discard(key)
+        self.cache[key] = statistics
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.capacity:
+            self.cache.popitem(last=False)
+        if notify:
+            self.updated.emit(key)
+
+        for alias in self.aliases.pop(key, []):
+            self.store(alias, statistics, notify)
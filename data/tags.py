@@ -0,0 +1,36 @@
+from enum import Enum, auto
+
+
+class ImageEditorFilterTag(Enum):
+    BLUR = auto()
+    SEPIA = auto()
+    GRAYSCALE = auto()
+    EDGES = auto()
+
+
+class ImageEditorTransformTag(Enum):
+    HORIZONTALFLIP = auto()
+    VERTICALFLIP = auto()
+    CLOCKROTATE = auto()
+    ANTICLOCKROTATE = auto()
+
+
+class ImageEditorControlTag(Enum):
+    OPEN = auto()
+    SAVE = auto()
+    SAVEAS = auto()
+    STATE = auto()
+
+
+class ImageEditorSceneTag(Enum):
+    START = auto()
+    FIRST = auto()
+    LAST = auto()
+    MIDDLE = auto()
+
+
+class ImageEditorJournalTag(Enum):
+    OPEN = auto()
+    OPERATION = auto()
+    KEYFRAME = auto()
+    HEAD = auto()
@@ -1,11 +1,11 @@
 from typing import Union
-from PIL import Image, ImageFilter
-from PySide6.QtCore import QDir, QEvent, QObject, Qt
+from PySide6.QtCore import QDir, QEvent, QObject, Qt, QTimer
 from PySide6.QtGui import QCloseEvent
 from PySide6.QtWidgets import QApplication, QFileDialog, QGraphicsView, QMainWindow, QMessageBox
 from data.dialog import ImageEditorImageInfo, ImageEditorMainWindow, ImageEditorResize, ImageEditorSettings
 from data.engine import ImageEditorControlTag, ImageEditorFilterTag, ImageEditorSceneTag, ImageEditorTransformTag
-import numpy as np
+from data.journal import ImageEditorJournal
+from data.operations import filter_pixmap, resize_pixmap, transform_pixmap
 import sys
 
 
@@ -15,6 +15,7 @@ class ImageEditor(ImageEditorMainWindow):
         super().__init__(parent)
         self.setup_action()
         self.graphicsView.installEventFilter(self)
+        QTimer.singleShot(0, self.restore_session)
     
     @property
     def scale_factor(self) -> float:
@@ -55,7 +56,11 @@ class ImageEditor(ImageEditorMainWindow):
         """Scale image from scale factor (decorator)"""
         self.graphicsView.resetTransform()
         self.graphicsView.scale(self.scale_factor, self.scale_factor)
-        self.fileSizeLabel.setText(f"{self.engine.info['size']} ({int(self.scale_factor * 100)}%)")
+        self.render_cache.zoom(self.scale_factor)
+        text = f"{self.engine.info['size']} ({int(self.scale_factor * 100)}%)"
+        if self.engine.frames:
+            text += f" [Frame {self.engine.frames.index + 1}/{self.engine.frames.count}]"
+        self.fileSizeLabel.setText(text)
 
     def scalewrap(func):
         """Scale (decorator)"""
@@ -72,6 +77,8 @@ class ImageEditor(ImageEditorMainWindow):
                 return
             
             self.graphicsView.setScene(self.engine.scene)
+            self.render_cache.reset(self.engine.item, self.engine.pixmap)
+            self.refresh_statistics()
 
             if self.settings["config"]["filePathInTitle"]:
                 combine_to_title = self.engine.info["path"]
@@ -155,6 +162,44 @@ class ImageEditor(ImageEditorMainWindow):
         self.control_action(ImageEditorControlTag.OPEN)
         self.location = self.engine.info["location"]
 
+    @update
+    def restore_session(self) -> bool:
+        """Restore last session when the program wasn't closed properly"""
+        session = ImageEditorJournal.load(self.session_file)
+        if not session.restorable:
+            return True
+
+        dialog = QMessageBox.question(
+            self.centralwidget,
+            "Restore session",
+            "<p>The last session was not closed properly, do you want to restore its changes?</p>",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if dialog == QMessageBox.No:
+            return True
+
+        self.engine.restore(session)
+        self.control_action(ImageEditorControlTag.OPEN)
+        self.location = self.engine.info["location"]
+
+    @update
+    def step_frame(self, step: int) -> bool:
+        """Show a neighbour frame of animated or multi-page image"""
+        if self.engine.empty or not self.engine.frames:
+            return True
+
+        if self.engine.changed:
+            dialog = QMessageBox.warning(
+                self.centralwidget,
+                "Change frame without save",
+                "<p>Are you sure do you want to change frame without save any changes?</p>", 
+                QMessageBox.Yes | QMessageBox.No
+            )
+            if dialog == QMessageBox.No:
+                return True
+
+        self.engine.step_frame(step)
+
     @update
     def resize_image(self) -> bool:
         """Resize image from dialog input"""
@@ -171,54 +216,23 @@ class ImageEditor(ImageEditorMainWindow):
                 return True
         
         try:
-            pixmap = self.engine.pixmap.scaled(new_width, new_height)
+            pixmap = resize_pixmap(self.engine.pixmap, new_width, new_height)
         except UnboundLocalError:
             return
 
-        self.engine.add(pixmap)
+        self.engine.add(pixmap, {"type": "resize", "size": [new_width, new_height]})
 
     @update
     def filter_image(self, tag: ImageEditorFilterTag) -> None:
         """Filter image (QPixmap) based on filter tag"""
-        image = Image.fromqpixmap(self.engine.pixmap)
-        mode = image.mode
-        if mode == "RGBA":
-            alpha = image.getchannel('A')
-
-        if tag is ImageEditorFilterTag.BLUR:
-            result = image.filter(ImageFilter.BLUR)
-        elif tag is ImageEditorFilterTag.EDGES:
-            result = image.filter(ImageFilter.FIND_EDGES)
-        elif tag is ImageEditorFilterTag.GRAYSCALE:
-            result = image.convert('L')
-        elif tag is ImageEditorFilterTag.SEPIA:
-            pix = np.array(image)
-            if mode == "RGBA":
-                sepia_filter = np.array([[.393, .769, .189, 0], [.349, .686, .168, 0], [.272, .534, .131, 0]])
-            else:    
-                sepia_filter = np.array([[.393, .769, .189], [.349, .686, .168], [.272, .534, .131]])
-            pix: np.ndarray = pix.dot(sepia_filter.T)
-            pix[pix>255] = 255
-            result = Image.fromarray(pix.astype(np.uint8))
-
-        if mode == "RGBA":
-            result.putalpha(alpha)
-        
-        self.engine.add(result.toqpixmap())
+        self.engine.add(filter_pixmap(self.engine.pixmap, tag), {"type": "filter", "tag": tag.name})
     
     @update
     def transform_image(self, tag: ImageEditorTransformTag) -> None:
         """Tranform image (QPixmap) based on transform tag"""
-        image = np.array(Image.fromqpixmap(self.engine.pixmap))
-        if tag is ImageEditorTransformTag.HORIZONTALFLIP:
-            image = np.fliplr(image)
-        elif tag is ImageEditorTransformTag.VERTICALFLIP:
-            image = np.flipud(image)
-        elif tag is ImageEditorTransformTag.CLOCKROTATE:
-            image = np.rot90(image, 1)
-        elif tag is ImageEditorTransformTag.ANTICLOCKROTATE:
-            image = np.rot90(image, -1)
-        self.engine.add(Image.fromarray(image).toqpixmap())
+        pixmap = transform_pixmap(self.engine.pixmap, tag)
+        self.statistics.inherit(self.engine.pixmap, pixmap)
+        self.engine.add(pixmap, {"type": "transform", "tag": tag.name})
 
     @update
     def undo(self) -> None:
@@ -255,6 +269,14 @@ class ImageEditor(ImageEditorMainWindow):
         """Zoom Out graphics view"""
         self.scale_factor -= factor
     
+    def refresh_statistics(self, key: int = None) -> None:
+        """Show statistics of actual image state in statistics panel"""
+        if self.engine.empty or not self.statisticsPanel.isVisible():
+            return
+        if key is not None and key != self.engine.pixmap.cacheKey():
+            return
+        self.statisticsPanel.show_statistics(self.statistics.get(self.engine.pixmap))
+
     def image_info(self) -> None:
         """Show image information in dialog"""
         ImageEditorImageInfo(self.engine.info, self.centralwidget).exec()
@@ -284,6 +306,8 @@ class ImageEditor(ImageEditorMainWindow):
         self.actionRedo.triggered.connect(self.redo)
 
         self.actionImageInfo.triggered.connect(self.image_info)
+        self.statisticsPanel.visibilityChanged.connect(lambda: self.refresh_statistics())
+        self.statistics.updated.connect(self.refresh_statistics)
         self.actionSettings.triggered.connect(self.set_settings)
         self.actionExit.triggered.connect(self.close)
         self.actionAbout.triggered.connect(self.about)
@@ -335,6 +359,13 @@ class ImageEditor(ImageEditorMainWindow):
                 self.graphicsView.setDragMode(QGraphicsView.ScrollHandDrag)
             return False
         else:
+            if event.type() == QEvent.KeyPress and self.engine.frames:
+                if event.key() == Qt.Key_PageDown:
+                    self.step_frame(1)
+                    return True
+                elif event.key() == Qt.Key_PageUp:
+                    self.step_frame(-1)
+                    return True
             self.graphicsView.verticalScrollBar().blockSignals(False)
             self.graphicsView.horizontalScrollBar().blockSignals(False)
             self.graphicsView.setDragMode(QGraphicsView.NoDrag)
@@ -344,6 +375,7 @@ class ImageEditor(ImageEditorMainWindow):
         """Custom close event | Confirm exit without save changes"""
         if not self.engine.changed:
             self.save_settings()
+            self.engine.journal.close(discard=True)
             return
         
         dialog = QMessageBox.warning(
@@ -355,6 +387,7 @@ class ImageEditor(ImageEditorMainWindow):
 
         if dialog == QMessageBox.Yes:
             self.save_settings()
+            self.engine.journal.close(discard=True)
             event.accept()
         else:
             event.ignore()
@@ -377,6 +410,7 @@ class ImageEditor(ImageEditorMainWindow):
             f"<p {p}>Press <b>Ctrl + Mouse Wheel</b> to Zoom In/Out</p>"
             f"<p {p}>Press <b>Shift + Mouse</b> to Hand Drag Navigate</p>"
             f"<p {p}>Press <b>F11</b> to Toogle Fullscreen</p>"
+            f"<p {p}>Press <b>Page Up/Down</b> to step through GIF/TIFF frames</p>"
             f"<h5 {h}>Licenced under <a {a} {license}>MIT Licence</a></h5>"
             f"<h5 {h}>Copyright &copy; Ádrian Gama 2021</h5>"
         )